@@ -1,70 +1,181 @@
 import os
+import hashlib
+import orjson
+import msgspec
+import random
 from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
 from fastapi.openapi.docs import get_swagger_ui_html
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Optional
 import sqlite3
-from datetime import datetime
+import asyncio
+import aiosqlite
+from contextlib import asynccontextmanager
+import time
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "sns_api.db")
 OPENAPI_PATH = os.path.join(os.path.dirname(__file__), "../openapi.yaml")
 
-app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+# The spec never changes while the app runs, so it is read and hashed once
+with open(OPENAPI_PATH, "rb") as f:
+    OPENAPI_BYTES = f.read()
+OPENAPI_ETAG = '"' + hashlib.blake2b(OPENAPI_BYTES, digest_size=16).hexdigest() + '"'
+OPENAPI_HEADERS = {"ETag": OPENAPI_ETAG, "Cache-Control": "public, max-age=3600"}
 
-# Enable CORS from everywhere
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Single shared connection; SQLite allows one writer at a time, so writes are serialized
+db_conn = None
+db_lock = asyncio.Lock()
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+async def connect_db():
+    conn = await aiosqlite.connect(DB_PATH, isolation_level=None, cached_statements=256)
+    conn.row_factory = aiosqlite.Row
+    await conn.execute("PRAGMA journal_mode=WAL")
+    await conn.execute("PRAGMA synchronous=NORMAL")
+    await conn.execute("PRAGMA temp_store=MEMORY")
+    await conn.execute("PRAGMA cache_size=-64000")
+    await conn.execute("PRAGMA mmap_size=268435456")
+    await conn.execute("PRAGMA foreign_keys=ON")
     return conn
 
-def init_db():
-    conn = get_db()
-    c = conn.cursor()
-    # Posts table
-    c.execute("""
-    CREATE TABLE IF NOT EXISTS posts (
+def get_db():
+    return db_conn
+
+async def execute_fetchone(conn, sql, params=()):
+    async with conn.execute(sql, params) as cursor:
+        return await cursor.fetchone()
+
+# Runs the enclosed statements as one write transaction, so they take the lock and commit once
+@asynccontextmanager
+async def write_transaction(conn):
+    async with db_lock:
+        await conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            await conn.execute("ROLLBACK")
+            # Readers share this connection and may have cached the uncommitted state
+            invalidate_posts_cache()
+            raise
+        await conn.execute("COMMIT")
+
+# Existence checks only need to know whether a row came back, so skip building a Row for it
+async def execute_exists(conn, sql, params=()):
+    async with conn.execute(sql, params) as cursor:
+        cursor.row_factory = None
+        return await cursor.fetchone() is not None
+
+# --- SQL Statements ---
+# Kept as constants so every call hits sqlite3's prepared statement cache
+SQL_SELECT_POSTS = """
+SELECT p.*,
+    (SELECT COUNT(*) FROM likes WHERE postId=p.id) AS likes,
+    (SELECT COUNT(*) FROM comments WHERE postId=p.id) AS comments
+FROM posts p
+"""
+SQL_SELECT_POST = SQL_SELECT_POSTS + "WHERE p.id=?"
+SQL_POST_EXISTS = "SELECT 1 FROM posts WHERE id=?"
+SQL_INSERT_POST = "INSERT INTO posts (id, username, content, createdAt, updatedAt) VALUES (?, ?, ?, ?, ?)"
+SQL_UPDATE_POST = """
+UPDATE posts SET username=?, content=?, updatedAt=? WHERE id=?
+RETURNING *,
+    (SELECT COUNT(*) FROM likes WHERE postId=posts.id) AS likes,
+    (SELECT COUNT(*) FROM comments WHERE postId=posts.id) AS comments
+"""
+SQL_DELETE_POST = "DELETE FROM posts WHERE id=?"
+SQL_SELECT_COMMENTS = "SELECT * FROM comments WHERE postId=?"
+SQL_SELECT_COMMENT = "SELECT * FROM comments WHERE id=? AND postId=?"
+SQL_INSERT_COMMENT = "INSERT INTO comments (id, postId, username, content, createdAt, updatedAt) VALUES (?, ?, ?, ?, ?, ?)"
+SQL_UPDATE_COMMENT = "UPDATE comments SET username=?, content=?, updatedAt=? WHERE id=? AND postId=? RETURNING *"
+SQL_DELETE_COMMENT = "DELETE FROM comments WHERE id=? AND postId=?"
+SQL_INSERT_LIKE = "INSERT OR IGNORE INTO likes (postId, username) SELECT ?, ? WHERE EXISTS (SELECT 1 FROM posts WHERE id=?)"
+SQL_DELETE_LIKE = "DELETE FROM likes WHERE postId=? AND username=?"
+
+# --- Schema ---
+# {table} lets migrate_foreign_keys() build a replacement table from the same definition
+CREATE_TABLE_SQL = {
+    "posts": """
+    CREATE TABLE IF NOT EXISTS {table} (
         id TEXT PRIMARY KEY,
         username TEXT NOT NULL,
         content TEXT NOT NULL,
         createdAt TEXT NOT NULL,
         updatedAt TEXT NOT NULL
     )
-    """)
-    # Comments table
-    c.execute("""
-    CREATE TABLE IF NOT EXISTS comments (
+    """,
+    "comments": """
+    CREATE TABLE IF NOT EXISTS {table} (
         id TEXT PRIMARY KEY,
         postId TEXT NOT NULL,
         username TEXT NOT NULL,
         content TEXT NOT NULL,
         createdAt TEXT NOT NULL,
-        updatedAt TEXT NOT NULL
+        updatedAt TEXT NOT NULL,
+        FOREIGN KEY (postId) REFERENCES posts(id) ON DELETE CASCADE
     )
-    """)
-    # Likes table
-    c.execute("""
-    CREATE TABLE IF NOT EXISTS likes (
+    """,
+    "likes": """
+    CREATE TABLE IF NOT EXISTS {table} (
         postId TEXT NOT NULL,
         username TEXT NOT NULL,
-        PRIMARY KEY (postId, username)
+        PRIMARY KEY (postId, username),
+        FOREIGN KEY (postId) REFERENCES posts(id) ON DELETE CASCADE
     )
-    """)
-    conn.commit()
-    conn.close()
+    """,
+}
+
+# Databases created before ON DELETE CASCADE was added get their child tables rebuilt with it.
+# Rows whose post is already gone are dropped on the way, since the foreign key would reject them.
+async def migrate_foreign_keys(conn):
+    stale = [table for table in ("comments", "likes")
+             if not await conn.execute_fetchall(f"PRAGMA foreign_key_list({table})")]
+    if not stale:
+        return
+    # foreign_keys can only be switched outside a transaction; off here so DROP TABLE does not cascade
+    await conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        async with write_transaction(conn):
+            for table in stale:
+                await conn.execute(CREATE_TABLE_SQL[table].format(table=f"{table}_new"))
+                await conn.execute(f"INSERT INTO {table}_new SELECT * FROM {table} WHERE postId IN (SELECT id FROM posts)")
+                await conn.execute(f"DROP TABLE {table}")
+                await conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    finally:
+        await conn.execute("PRAGMA foreign_keys=ON")
 
-@app.on_event("startup")
-def startup_event():
-    init_db()
+async def init_db():
+    conn = get_db()
+    for table in ("posts", "comments", "likes"):
+        await conn.execute(CREATE_TABLE_SQL[table].format(table=table))
+    await migrate_foreign_keys(conn)
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_comments_postId ON comments(postId)")
+    # Collect planner statistics once; PRAGMA optimize at shutdown keeps them current afterwards
+    if not await execute_exists(conn, "SELECT 1 FROM sqlite_master WHERE name='sqlite_stat1'"):
+        await conn.execute("ANALYZE")
+
+# Open the connection on startup; refresh planner statistics and close it on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global db_conn
+    db_conn = await connect_db()
+    try:
+        await init_db()
+        yield
+        await db_conn.execute("PRAGMA optimize")
+    finally:
+        await db_conn.close()
+        db_conn = None
+
+app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None, lifespan=lifespan)
+
+# Enable CORS from everywhere
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
 
 # Serve Swagger UI at default endpoint
 @app.get("/", include_in_schema=False)
@@ -73,12 +184,15 @@ def swagger_ui():
 
 # Serve exact OpenAPI YAML at default endpoint
 @app.get("/openapi.yaml", include_in_schema=False)
-def openapi_yaml():
-    return FileResponse(OPENAPI_PATH, media_type="application/yaml")
+async def openapi_yaml(request: Request):
+    if etag_matches(request, OPENAPI_ETAG):
+        return Response(status_code=304, headers=OPENAPI_HEADERS)
+    return Response(OPENAPI_BYTES, media_type="application/yaml", headers=OPENAPI_HEADERS)
 
 # ...existing code for endpoints will be added here...
-# --- Pydantic Models ---
-class Post(BaseModel):
+# --- Response Models ---
+# Built from database rows, so msgspec structs encode them without a validation pass
+class Post(msgspec.Struct):
     id: str
     username: str
     content: str
@@ -87,21 +201,22 @@ class Post(BaseModel):
     likes: int
     comments: int
 
-class PostCreate(BaseModel):
+class Comment(msgspec.Struct):
+    id: str
+    postId: str
     username: str
     content: str
+    createdAt: str
+    updatedAt: str
 
-class PostUpdate(BaseModel):
+# --- Pydantic Models ---
+class PostCreate(BaseModel):
     username: str
     content: str
 
-class Comment(BaseModel):
-    id: str
-    postId: str
+class PostUpdate(BaseModel):
     username: str
     content: str
-    createdAt: str
-    updatedAt: str
 
 class CommentCreate(BaseModel):
     username: str
@@ -122,208 +237,224 @@ class Error(BaseModel):
     code: int
 
 # --- Utility Functions ---
+# orjson-encoded JSON; FastAPI's ORJSONResponse is deprecated, so the bytes go into a plain Response
+def json_response(content, status_code: int = 200):
+    return Response(orjson.dumps(content), status_code=status_code, media_type="application/json")
+
+# If-None-Match can list several tags, weak W/ tags or *; conditional GETs compare tags weakly (RFC 9110)
+def etag_matches(request: Request, etag: str):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
 def error_response(message: str, code: int):
-    return JSONResponse(status_code=code, content={"message": message, "code": code})
+    return json_response({"message": message, "code": code}, code)
+
+def struct_response(obj, status_code: int = 200):
+    return Response(msgspec.json.encode(obj), status_code=status_code, media_type="application/json")
+
+# UTC timestamp like datetime.utcnow().isoformat(), but always with six fractional digits (isoformat drops them at .000000);
+# the seconds part is only re-formatted once per second
+_now_second = None
+_now_prefix = ""
+
+def utc_now():
+    global _now_second, _now_prefix
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    if second != _now_second:
+        _now_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _now_second = second
+    return f"{_now_prefix}.{nanos // 1000:06d}"
+
+# IDs are opaque and not security-sensitive, so a seeded PRNG replaces an os.urandom syscall per insert
+_id_rng = random.Random(os.urandom(32))
+
+def new_id():
+    return f"{_id_rng.getrandbits(64):016x}"
+
+# --- Posts List Cache ---
+# The serialized /posts body is reused until a write touches posts, comments or likes.
+# posts_version tracks this process's writes; PRAGMA data_version changes when any other connection
+# (another worker or process) commits. Reading it is a counter lookup with no disk I/O.
+posts_version = 0
+posts_cache = {}
+
+def invalidate_posts_cache():
+    global posts_version
+    posts_version += 1
 
 # --- Endpoints ---
-# List Posts
-@app.get("/posts", response_model=List[Post])
-def list_posts():
+# List Posts (rows are trusted, so they skip Pydantic and go straight to orjson)
+@app.get("/posts")
+async def list_posts(request: Request):
     conn = get_db()
-    c = conn.cursor()
-    posts = c.execute("SELECT * FROM posts").fetchall()
-    result = []
-    for post in posts:
-        post_id = post["id"]
-        likes = c.execute("SELECT COUNT(*) FROM likes WHERE postId=?", (post_id,)).fetchone()[0]
-        comments = c.execute("SELECT COUNT(*) FROM comments WHERE postId=?", (post_id,)).fetchone()[0]
-        result.append(Post(**dict(post), likes=likes, comments=comments))
-    conn.close()
-    return result
+    version = (posts_version, (await execute_fetchone(conn, "PRAGMA data_version"))[0])
+    cached = posts_cache.get("posts_list")
+    if not cached or cached[0] != version:
+        posts = await conn.execute_fetchall(SQL_SELECT_POSTS)
+        body = orjson.dumps([dict(post) for post in posts])
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        cached = posts_cache["posts_list"] = (version, etag, body)
+    _, etag, body = cached
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 # Create Post
-@app.post("/posts", response_model=Post, status_code=201)
-def create_post(data: PostCreate):
+@app.post("/posts", status_code=201)
+async def create_post(data: PostCreate):
     conn = get_db()
-    c = conn.cursor()
-    post_id = os.urandom(8).hex()
-    now = datetime.utcnow().isoformat()
+    post_id = new_id()
+    now = utc_now()
     try:
-        c.execute("INSERT INTO posts (id, username, content, createdAt, updatedAt) VALUES (?, ?, ?, ?, ?)",
-                  (post_id, data.username, data.content, now, now))
-        conn.commit()
-        likes = 0
-        comments = 0
-        post = Post(id=post_id, username=data.username, content=data.content, createdAt=now, updatedAt=now, likes=likes, comments=comments)
-        return post
+        async with db_lock:
+            await conn.execute(SQL_INSERT_POST, (post_id, data.username, data.content, now, now))
+            invalidate_posts_cache()
+        post = Post(id=post_id, username=data.username, content=data.content, createdAt=now, updatedAt=now, likes=0, comments=0)
+        return struct_response(post, 201)
     except Exception as e:
         return error_response("Could not create post", 400)
-    finally:
-        conn.close()
 
 # Get Single Post
-@app.get("/posts/{postId}", response_model=Post)
-def get_post(postId: str):
+@app.get("/posts/{postId}")
+async def get_post(postId: str):
     conn = get_db()
-    c = conn.cursor()
-    post = c.execute("SELECT * FROM posts WHERE id=?", (postId,)).fetchone()
+    post = await execute_fetchone(conn, SQL_SELECT_POST, (postId,))
     if not post:
-        conn.close()
         return error_response("Post not found", 404)
-    likes = c.execute("SELECT COUNT(*) FROM likes WHERE postId=?", (postId,)).fetchone()[0]
-    comments = c.execute("SELECT COUNT(*) FROM comments WHERE postId=?", (postId,)).fetchone()[0]
-    result = Post(**dict(post), likes=likes, comments=comments)
-    conn.close()
-    return result
+    return struct_response(Post(**dict(post)))
 
 # Update Post
-@app.patch("/posts/{postId}", response_model=Post)
-def update_post(postId: str, data: PostUpdate):
+@app.patch("/posts/{postId}")
+async def update_post(postId: str, data: PostUpdate):
     conn = get_db()
-    c = conn.cursor()
-    post = c.execute("SELECT * FROM posts WHERE id=?", (postId,)).fetchone()
-    if not post:
-        conn.close()
-        return error_response("Post not found", 404)
-    now = datetime.utcnow().isoformat()
+    now = utc_now()
     try:
-        c.execute("UPDATE posts SET username=?, content=?, updatedAt=? WHERE id=?",
-                  (data.username, data.content, now, postId))
-        conn.commit()
-        likes = c.execute("SELECT COUNT(*) FROM likes WHERE postId=?", (postId,)).fetchone()[0]
-        comments = c.execute("SELECT COUNT(*) FROM comments WHERE postId=?", (postId,)).fetchone()[0]
-        result = Post(id=postId, username=data.username, content=data.content, createdAt=post["createdAt"], updatedAt=now, likes=likes, comments=comments)
-        return result
+        async with db_lock:
+            post = await execute_fetchone(conn, SQL_UPDATE_POST, (data.username, data.content, now, postId))
+            if post:
+                invalidate_posts_cache()
     except Exception as e:
         return error_response("Could not update post", 400)
-    finally:
-        conn.close()
+    if not post:
+        return error_response("Post not found", 404)
+    return struct_response(Post(**dict(post)))
 
 # Delete Post
 @app.delete("/posts/{postId}", status_code=204)
-def delete_post(postId: str):
+async def delete_post(postId: str):
     conn = get_db()
-    c = conn.cursor()
-    post = c.execute("SELECT * FROM posts WHERE id=?", (postId,)).fetchone()
-    if not post:
-        conn.close()
+    # Comments and likes are removed by ON DELETE CASCADE
+    async with write_transaction(conn):
+        cursor = await conn.execute(SQL_DELETE_POST, (postId,))
+        deleted = cursor.rowcount
+        if deleted:
+            invalidate_posts_cache()
+    if not deleted:
         return error_response("Post not found", 404)
-    c.execute("DELETE FROM posts WHERE id=?", (postId,))
-    c.execute("DELETE FROM comments WHERE postId=?", (postId,))
-    c.execute("DELETE FROM likes WHERE postId=?", (postId,))
-    conn.commit()
-    conn.close()
     return Response(status_code=204)
 
-# List Comments for a Post
-@app.get("/posts/{postId}/comments", response_model=List[Comment])
-def list_comments(postId: str):
+# List Comments for a Post (serialized straight from the rows like List Posts)
+@app.get("/posts/{postId}/comments")
+async def list_comments(postId: str):
     conn = get_db()
-    c = conn.cursor()
-    comments = c.execute("SELECT * FROM comments WHERE postId=?", (postId,)).fetchall()
-    result = [Comment(**dict(comment)) for comment in comments]
-    conn.close()
-    return result
+    comments = await conn.execute_fetchall(SQL_SELECT_COMMENTS, (postId,))
+    return json_response([dict(comment) for comment in comments])
 
 # Create Comment
-@app.post("/posts/{postId}/comments", response_model=Comment, status_code=201)
-def create_comment(postId: str, data: CommentCreate):
+@app.post("/posts/{postId}/comments", status_code=201)
+async def create_comment(postId: str, data: CommentCreate):
     conn = get_db()
-    c = conn.cursor()
-    comment_id = os.urandom(8).hex()
-    now = datetime.utcnow().isoformat()
+    comment_id = new_id()
+    now = utc_now()
     try:
-        c.execute("INSERT INTO comments (id, postId, username, content, createdAt, updatedAt) VALUES (?, ?, ?, ?, ?, ?)",
-                  (comment_id, postId, data.username, data.content, now, now))
-        conn.commit()
+        async with db_lock:
+            await conn.execute(SQL_INSERT_COMMENT, (comment_id, postId, data.username, data.content, now, now))
+            invalidate_posts_cache()
         comment = Comment(id=comment_id, postId=postId, username=data.username, content=data.content, createdAt=now, updatedAt=now)
-        return comment
+        return struct_response(comment, 201)
+    except sqlite3.IntegrityError:
+        return error_response("Post not found", 404)
     except Exception as e:
         return error_response("Could not create comment", 400)
-    finally:
-        conn.close()
 
 # Get Specific Comment
-@app.get("/posts/{postId}/comments/{commentId}", response_model=Comment)
-def get_comment(postId: str, commentId: str):
+@app.get("/posts/{postId}/comments/{commentId}")
+async def get_comment(postId: str, commentId: str):
     conn = get_db()
-    c = conn.cursor()
-    comment = c.execute("SELECT * FROM comments WHERE id=? AND postId=?", (commentId, postId)).fetchone()
+    comment = await execute_fetchone(conn, SQL_SELECT_COMMENT, (commentId, postId))
     if not comment:
-        conn.close()
         return error_response("Comment not found", 404)
-    result = Comment(**dict(comment))
-    conn.close()
-    return result
+    return struct_response(Comment(**dict(comment)))
 
 # Update Comment
-@app.patch("/posts/{postId}/comments/{commentId}", response_model=Comment)
-def update_comment(postId: str, commentId: str, data: CommentUpdate):
+@app.patch("/posts/{postId}/comments/{commentId}")
+async def update_comment(postId: str, commentId: str, data: CommentUpdate):
     conn = get_db()
-    c = conn.cursor()
-    comment = c.execute("SELECT * FROM comments WHERE id=? AND postId=?", (commentId, postId)).fetchone()
-    if not comment:
-        conn.close()
-        return error_response("Comment not found", 404)
-    now = datetime.utcnow().isoformat()
+    now = utc_now()
     try:
-        c.execute("UPDATE comments SET username=?, content=?, updatedAt=? WHERE id=? AND postId=?",
-                  (data.username, data.content, now, commentId, postId))
-        conn.commit()
-        result = Comment(id=commentId, postId=postId, username=data.username, content=data.content, createdAt=comment["createdAt"], updatedAt=now)
-        return result
+        async with db_lock:
+            comment = await execute_fetchone(conn, SQL_UPDATE_COMMENT, (data.username, data.content, now, commentId, postId))
     except Exception as e:
         return error_response("Could not update comment", 400)
-    finally:
-        conn.close()
+    if not comment:
+        return error_response("Comment not found", 404)
+    return struct_response(Comment(**dict(comment)))
 
 # Delete Comment
 @app.delete("/posts/{postId}/comments/{commentId}", status_code=204)
-def delete_comment(postId: str, commentId: str):
+async def delete_comment(postId: str, commentId: str):
     conn = get_db()
-    c = conn.cursor()
-    comment = c.execute("SELECT * FROM comments WHERE id=? AND postId=?", (commentId, postId)).fetchone()
-    if not comment:
-        conn.close()
+    async with db_lock:
+        cursor = await conn.execute(SQL_DELETE_COMMENT, (commentId, postId))
+        deleted = cursor.rowcount
+        if deleted:
+            invalidate_posts_cache()
+    if not deleted:
         return error_response("Comment not found", 404)
-    c.execute("DELETE FROM comments WHERE id=? AND postId=?", (commentId, postId))
-    conn.commit()
-    conn.close()
     return Response(status_code=204)
 
 # Like a Post
 @app.post("/posts/{postId}/likes", status_code=201)
-def like_post(postId: str, data: LikeCreate):
+async def like_post(postId: str, data: LikeCreate):
     conn = get_db()
-    c = conn.cursor()
-    post = c.execute("SELECT * FROM posts WHERE id=?", (postId,)).fetchone()
-    if not post:
-        conn.close()
-        return error_response("Post not found", 404)
     try:
-        c.execute("INSERT INTO likes (postId, username) VALUES (?, ?)", (postId, data.username))
-        conn.commit()
-        return Response(status_code=201)
+        async with db_lock:
+            cursor = await conn.execute(SQL_INSERT_LIKE, (postId, data.username, postId))
+            inserted = cursor.rowcount
+            if inserted:
+                invalidate_posts_cache()
     except Exception as e:
         return error_response("Could not like post", 400)
-    finally:
-        conn.close()
+    if inserted:
+        return Response(status_code=201)
+    # Nothing inserted: either the post is missing or it was already liked
+    if not await execute_exists(conn, SQL_POST_EXISTS, (postId,)):
+        return error_response("Post not found", 404)
+    return error_response("Could not like post", 400)
 
 # Unlike a Post
 @app.delete("/posts/{postId}/likes", status_code=204)
-def unlike_post(postId: str, data: LikeDelete):
+async def unlike_post(postId: str, data: LikeDelete):
     conn = get_db()
-    c = conn.cursor()
-    post = c.execute("SELECT * FROM posts WHERE id=?", (postId,)).fetchone()
-    if not post:
-        conn.close()
+    async with db_lock:
+        cursor = await conn.execute(SQL_DELETE_LIKE, (postId, data.username))
+        deleted = cursor.rowcount
+        if deleted:
+            invalidate_posts_cache()
+    # Nothing deleted: only a missing post is an error, unliking twice is not
+    if not deleted and not await execute_exists(conn, SQL_POST_EXISTS, (postId,)):
         return error_response("Post not found", 404)
-    c.execute("DELETE FROM likes WHERE postId=? AND username=?", (postId, data.username))
-    conn.commit()
-    conn.close()
     return Response(status_code=204)
 
 # --- Run the app on port 8000 ---
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvicorn picks uvloop and httptools automatically when they are installed (uvicorn[standard]);
+    # workers default to 1 and follow WEB_CONCURRENCY; each worker process opens its own connection at startup
+    uvicorn.run("main:app", app_dir=os.path.dirname(os.path.abspath(__file__)), host="0.0.0.0", port=8000)